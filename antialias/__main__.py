@@ -1,20 +1,25 @@
 """The main entrypoint."""
 
+import contextlib
+import functools
 import itertools
-import json
+import marshal
 import os
 import re
 import shlex
 import sys
-from collections.abc import Iterable, Iterator
-from dataclasses import asdict, dataclass, field
+import zlib
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from operator import attrgetter
 from pathlib import Path
 from types import MappingProxyType
 from typing import TypeVar
 
 import click
 
-T = TypeVar("T")
+RecordT = TypeVar("RecordT", bound="AbstractFunctionRecord")
+SourceRecordT = TypeVar("SourceRecordT", bound="SourceFunctionRecord")
 
 SPECIAL_FUNCTIONS = MappingProxyType(
     {
@@ -23,9 +28,16 @@ SPECIAL_FUNCTIONS = MappingProxyType(
     },
 )
 
-CWD = Path.cwd().resolve()
-HOME_DIR = Path.home()
 EVAL_COMMAND = "eval"
+DEFAULT_FUNCTION_REGEXP = (
+    r"^\s*(?:function\s+)?(?P<function_name>\w+)\s*(?:\(\))?"
+    + r"\s*\{\s*(?:#\s*(?P<comment>.*))?$"
+)
+EXECUTABLE_MODE = 0o111
+RE2_MISSED_WHITESPACE = "\v\x1c\x1d\x1e\x1f"
+DEFINITIONS_CACHE_FILE = "definitions.json"
+# Ends the key at the start of a cache file; the keys never contain it.
+CACHE_KEY_END = b"\0"
 BASH_COMPLETION_TEMPLATE = """
 _{wrapper_name}_completion() {{
     local cur prev opts
@@ -35,7 +47,11 @@ _{wrapper_name}_completion() {{
     opts="{names}"
 
     if [[ ${{COMP_CWORD}} -eq 1 ]]; then
-        COMPREPLY=( $(compgen -W "${{opts}}" -- "${{cur}}") )
+        # One name per line, which may have spaces.
+        local matches IFS
+        matches=$(compgen -W "${{opts}}" -- "${{cur}}")
+        IFS=$'\\n'
+        COMPREPLY=( ${{matches}} )
     fi
 }}
 
@@ -62,26 +78,31 @@ _{wrapper_name}_completion() {{
 
 compdef _{wrapper_name}_completion {wrapper_name}
 """
+ZSH_SUBCOMMANDS_SEPARATOR = "\n        "
+DOUBLE_QUOTE_ESCAPES = str.maketrans({char: f"\\{char}" for char in '"$`\\'})
 
 
-@dataclass
+@dataclass(slots=True)
 class Override:
     """Function definition override."""
 
-    name: str = None
-    help: str = None
-    aliases: set[str] = field(default_factory=set)
+    name: str | None = None
+    help: str | None = None
+    aliases: frozenset[str] = frozenset()
 
     def __post_init__(self):
-        self.aliases = set(self.aliases)
+        self.aliases = frozenset(self.aliases)
         if self.name is not None:
-            self.aliases.add(self.name)
+            self.aliases |= {self.name}
 
 
 _NULL_OVERRIDE = Override()
 
+# Function overrides by the path they apply to; `None` applies to all paths.
+Overrides = dict[Path | str | None, dict[str, dict[str, Override]]]
 
-@dataclass
+
+@dataclass(slots=True)
 class Config:
     """Configuration for the application."""
 
@@ -89,13 +110,8 @@ class Config:
     script_directories: list[Path] = field(default_factory=list)
     underscore_to_dash: bool = False
     keep_original_name: bool = False
-    function_regexp: str = (
-        r"^\s*(?:function\s+)?(?P<function_name>\w+)\s*(?:\(\))?"
-        + r"\s*\{\s*(?:#\s*(?P<comment>.*))?$"
-    )
-    overrides: dict[Path | None, dict[str, Override]] = field(
-        default_factory=lambda: {"*": {"functions": {}}}
-    )
+    function_regexp: str = DEFAULT_FUNCTION_REGEXP
+    overrides: Overrides = field(default_factory=lambda: {"*": {"functions": {}}})
 
     @classmethod
     def from_dict(cls, data: dict, *, files_root: Path = Path()) -> "Config":
@@ -108,12 +124,13 @@ class Config:
         resolved_source_files = cls._resolve_paths(files_root, source_files)
         resolved_script_directories = cls._resolve_paths(files_root, script_directories)
 
-        initialized_overrides = {}
+        initialized_overrides: Overrides = {}
         for input_path, overrides_data in overrides.items():
+            path: Path | None
             if input_path == "*":
                 path = None
             else:
-                path = cls._resolve_one_path(files_root, input_path)
+                path = _resolve_one_path(files_root, input_path)
 
             function_overrides = overrides_data.pop("functions", {})
 
@@ -131,49 +148,107 @@ class Config:
         )
 
     @classmethod
-    def _resolve_paths(cls, files_root, files):
+    def _resolve_paths(cls, files_root: Path, files: list[str]) -> list[Path]:
         resolved_files = []
         for path_str in files:
-            path = cls._resolve_one_path(files_root, path_str)
+            path = _resolve_one_path(files_root, path_str)
             resolved_files.append(path)
         return resolved_files
 
-    @classmethod
-    def _resolve_one_path(cls, files_root, path_str):
-        path = Path(path_str).expanduser()
-        if not path.is_absolute():
-            path = files_root / path
-        return path.resolve()
-
-    def extract(self, path: list[str]):  # noqa: ANN201
+    def to_dict(self) -> dict:
+        """Convert the config to a JSON-serializable dictionary."""
+        return {
+            "source_files": [str(path) for path in self.source_files],
+            "script_directories": [str(path) for path in self.script_directories],
+            "underscore_to_dash": self.underscore_to_dash,
+            "keep_original_name": self.keep_original_name,
+            "function_regexp": self.function_regexp,
+            "overrides": {
+                "*" if path is None else str(path): {
+                    "functions": {
+                        name: {
+                            "name": override.name,
+                            "help": override.help,
+                            "aliases": sorted(override.aliases),
+                        }
+                        for name, override in overrides_data["functions"].items()
+                    }
+                }
+                for path, overrides_data in self.overrides.items()
+            },
+        }
+
+    def extract(self, path: list[str | Path | None]):  # noqa: ANN201
         """Extract the config using the path.
 
         Returns:
             The value at the path, or None if it doesn't exist.
         """
-        first_key, *path = path
-        data = getattr(self, first_key)
-        for key in path:
+        first_key, *keys = path
+        data = getattr(self, str(first_key))
+        for key in keys:
             if key not in data:
                 return None
             data = data[key]
         return data
 
 
-@dataclass
+_RESOLVED_PATHS: dict[Path, Path] = {}
+
+
+@functools.cache
+def _resolve_one_path(files_root: Path, path_str: str) -> Path:
+    # Work with strings and create a single `Path` for the result, rather than
+    # an intermediate `Path` for every step.
+    path_str = os.path.expanduser(path_str)  # noqa: PTH111 Intentionally using os.path
+    if not os.path.isabs(path_str):  # noqa: PTH117 Intentionally using os.path
+        path_str = os.path.join(files_root, path_str)  # noqa: PTH118 Intentionally using os.path
+    # Different strings may resolve to the same path, e.g. "dir" and "./dir".
+    # Return the same object for them, so comparing them is an identity check.
+    resolved_path = Path(os.path.realpath(path_str))
+    return _RESOLVED_PATHS.setdefault(resolved_path, resolved_path)
+
+
+@functools.cache
+def _shrink_path(path: Path) -> Path:
+    """Shrink the path to make it more readable."""
+    home_dir = _home_dir()
+    if path.is_relative_to(home_dir):
+        return "~" / path.relative_to(home_dir)
+    return path
+
+
+@functools.cache
+def _home_dir() -> Path:
+    """Get the home directory, looking it up only when it's needed."""
+    return Path.home()
+
+
+def _default_config_path() -> str:
+    return f"{_home_dir()}/.antialias.json"
+
+
+def _default_cache_dir() -> str:
+    cache_home = os.getenv("XDG_CACHE_HOME") or _home_dir() / ".cache"
+    return str(Path(cache_home) / "antialias")
+
+
+@dataclass(slots=True)
 class AbstractFunctionRecord:
     """Base function's metadata implementation."""
 
     name: str
     original_name: str
-    help: str = None
-    aliases: set[str] = field(default_factory=set)
+    help: str | None = None
+    aliases: tuple[str, ...] = ()
 
     def __post_init__(self):
         if self.help is None:
             self.help = ""
 
-    def format_command(self, args: tuple[str], *, name: str | None = None) -> str:
+    def format_command(
+        self, args: Sequence[str], *, name: str | Path | None = None, **_
+    ) -> str:
         """Format the command to be executed."""
         if name is None:
             name = self.original_name
@@ -181,56 +256,89 @@ class AbstractFunctionRecord:
         return f"{name} {args_str}"
 
 
-@dataclass
+@dataclass(slots=True)
 class SpecialFunctionRecord(AbstractFunctionRecord):
     """Metadata for a special function."""
 
-    def format_command(self, args: tuple[str], **_) -> str:
+    def format_command(
+        self, args: Sequence[str], *, argv_prefix: Sequence[str] = (), **_
+    ) -> str:
         """Format the command to execute the actual subcommand."""
         func_name = self.original_name
-        original_args = tuple(
-            itertools.takewhile(lambda a: a != EVAL_COMMAND, sys.argv)
-        )
-        actual_name, *actual_args = (*original_args, func_name, *args)
+        actual_name, *actual_args = (*argv_prefix, func_name, *args)  # type: ignore[misc]
 
-        return super().format_command(actual_args, name=actual_name)
+        # `slots=True` recreates the class, which breaks the zero-argument
+        # `super()`, so the class is passed explicitly.
+        return super(SpecialFunctionRecord, self).format_command(
+            actual_args, name=actual_name
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class SourceFunctionRecord(AbstractFunctionRecord):
     """Metadata for a function defined in a source file."""
 
     path: Path = field(kw_only=True)
+    # The path as shown to the user, computed once when the record is built.
+    display_path: Path = field(kw_only=True, repr=False, compare=False)
 
     @classmethod
     def build_all(
-        cls: type[T],
+        cls: type[SourceRecordT],
         original_name: str,
         path: Path,
         config: Config,
         *,
         comment: str | None = None,
-    ) -> dict[str, T]:
+    ) -> dict[str, SourceRecordT]:
         """Build the records according to a config."""
-        names = cls._get_names(original_name, path, config)
-        overridden_help = cls._get_override(original_name, path, config).help
-
-        functions = {}
-        for name in names:
-            functions[name] = cls(
+        override = cls._get_override(original_name, path, config)
+        # Sorted, so that the aliases are listed in a stable order.
+        names = tuple(sorted(cls._get_names(original_name, override, config)))
+        help_text = override.help or comment
+        display_path = _shrink_path(path)
+
+        # Each alias gets its own record, since the records differ by name.
+        return {
+            name: cls(
                 name=name,
                 original_name=original_name,
-                help=overridden_help or comment,
+                help=help_text,
                 path=path,
+                display_path=display_path,
                 aliases=names,
             )
+            for name in names
+        }
 
-        return functions
+    def to_tuple(self) -> tuple:
+        """Convert the record to built-in types, e.g. for caching."""
+        return (self.name, self.original_name, self.help, self.aliases, str(self.path))
 
     @classmethod
-    def _get_names(cls, original_name: str, path: Path, config: Config) -> set[str]:
-        names = set()
-        override = cls._get_override(original_name, path, config)
+    def from_tuple(  # noqa: PYI019 `Self` requires Python 3.11
+        cls: type[SourceRecordT], data: tuple, paths: Mapping[str, Path]
+    ) -> SourceRecordT:
+        """Create a record from the `to_tuple()` output.
+
+        The paths are looked up by their text, so that the records share them.
+        """
+        name, original_name, help_text, aliases, path_text = data
+        path = paths[path_text]
+        return cls(
+            name=name,
+            original_name=original_name,
+            help=help_text,
+            aliases=aliases,
+            path=path,
+            display_path=_shrink_path(path),
+        )
+
+    @classmethod
+    def _get_names(
+        cls, original_name: str, override: Override, config: Config
+    ) -> set[str]:
+        names: set[str] = set()
 
         if override is not _NULL_OVERRIDE:
             names.update(override.aliases)
@@ -253,18 +361,22 @@ class SourceFunctionRecord(AbstractFunctionRecord):
         return override or _NULL_OVERRIDE
 
 
-@dataclass
+@dataclass(slots=True)
 class ScriptFunctionRecord(SourceFunctionRecord):
     """Metadata for a function defined in a source file."""
 
-    def format_command(self, args: tuple[str], **_) -> str:
+    def format_command(self, args: Sequence[str], **_) -> str:
         """Format the command for an executable file in a directory."""
         name = self.path / self.original_name
-        return super().format_command(args, name=name)
+        return super(ScriptFunctionRecord, self).format_command(args, name=name)
 
     @classmethod
-    def _get_names(cls, original_name, path, config):
-        names = super()._get_names(original_name, path, config)
+    def _get_names(
+        cls, original_name: str, override: Override, config: Config
+    ) -> set[str]:
+        names = super(ScriptFunctionRecord, cls)._get_names(
+            original_name, override, config
+        )
         for name in names.copy():
             # Drop an extension, if it exists.
             if name != original_name or not config.keep_original_name:
@@ -278,39 +390,101 @@ class Registry:
     """Registry of functions."""
 
     config: Config
-    source_functions: dict[str, SourceFunctionRecord] = field(default_factory=dict)
-    script_functions: dict[str, ScriptFunctionRecord] = field(default_factory=dict)
-    special_functions: dict[str, SpecialFunctionRecord] = field(default_factory=dict)
+    cache_dir: Path | None = None
+    # The file to cache the source function records in, if any.
+    source_cache: Path | None = None
+
+    # The functions are discovered on the first access, so that the commands
+    # that need only some of them don't scan the rest.
+
+    @functools.cached_property
+    def source_functions(self) -> dict[str, SourceFunctionRecord]:
+        """Functions defined in the source files."""
+        if self.source_cache is None:
+            return self._discover_source_functions()
+
+        key = _source_cache_key(self.config)
+        cached = _read_cache(self.source_cache, key)
+        if cached is not None:
+            paths = {str(path): path for path in self.config.source_files}
+            return {
+                data[0]: SourceFunctionRecord.from_tuple(data, paths) for data in cached
+            }
 
-    def __post_init__(self):
-        """Initialize the registry."""
-        for path in self.config.source_files:
-            functions = self._get_source_functions(path)
-            self.source_functions.update(functions)
+        source_functions = self._discover_source_functions()
+        _write_cache(
+            self.source_cache,
+            key,
+            [record.to_tuple() for record in source_functions.values()],
+        )
+        return source_functions
+
+    @functools.cached_property
+    def script_functions(self) -> dict[str, ScriptFunctionRecord]:
+        """Executable scripts in the script directories.
 
-        for special_name, (name, comment) in SPECIAL_FUNCTIONS.items():
-            self.special_functions[special_name] = SpecialFunctionRecord(
+        They are not cached, since checking whether a directory changed takes
+        the same scan and stat calls as listing it.
+        """
+        script_functions = {}
+        for path in self.config.script_directories:
+            script_functions.update(self._get_directory_functions(path))
+        return script_functions
+
+    @functools.cached_property
+    def special_functions(self) -> dict[str, SpecialFunctionRecord]:
+        """Functions provided by antialias itself."""
+        return {
+            special_name: SpecialFunctionRecord(
                 name=special_name,
                 original_name=name,
                 help=comment,
             )
+            for special_name, (name, comment) in SPECIAL_FUNCTIONS.items()
+        }
 
-        for path in self.config.script_directories:
-            for subpath in path.iterdir():
-                if subpath.is_file() and os.access(subpath, os.X_OK):
-                    functions = self._get_script_functions(subpath)
-                    self.script_functions.update(functions)
+    # The regexps are only needed when a source file has to be scanned.
 
-    def _get_source_functions(self, path: Path) -> dict[str, SourceFunctionRecord]:
-        functions = {}
+    @functools.cached_property
+    def _function_re(self) -> re.Pattern[str]:
+        return re.compile(
+            self.config.function_regexp, flags=re.MULTILINE | re.IGNORECASE
+        )
+
+    @functools.cached_property
+    def _function_re2(self) -> re.Pattern[str] | None:
+        return _compile_re2(self.config.function_regexp)
 
-        text = path.read_text()
-        for match in re.finditer(
-            self.config.function_regexp, text, flags=re.MULTILINE | re.IGNORECASE
-        ):
-            original_name = match.group("function_name")
-            comment = match.group("comment")
+    def _discover_source_functions(self) -> dict[str, SourceFunctionRecord]:
+        definitions_cache = self._load_definitions_cache()
+        loaded_definitions_cache = definitions_cache.copy()
+
+        source_functions = {}
+        for path in self.config.source_files:
+            functions = self._get_source_functions(
+                path, definitions_cache=definitions_cache
+            )
+            source_functions.update(functions)
+
+        # The cache is shared by all configs, so the entries of the other
+        # configs' files are kept, unless the files were deleted.
+        source_paths = {str(path) for path in self.config.source_files}
+        definitions_cache = {
+            path: entry
+            for path, entry in definitions_cache.items()
+            if path in source_paths or Path(path).exists()
+        }
+        if definitions_cache != loaded_definitions_cache:
+            self._save_definitions_cache(definitions_cache)
+
+        return source_functions
+
+    def _get_source_functions(
+        self, path: Path, *, definitions_cache: dict[str, dict]
+    ) -> dict[str, SourceFunctionRecord]:
+        functions = {}
 
+        for original_name, comment in self._get_definitions(path, definitions_cache):
             functions.update(
                 SourceFunctionRecord.build_all(
                     original_name,
@@ -321,19 +495,95 @@ class Registry:
             )
         return functions
 
-    def _get_script_functions(self, path: Path) -> dict[str, ScriptFunctionRecord]:
-        return ScriptFunctionRecord.build_all(path.name, path.parent, self.config)
+    def _get_definitions(
+        self, path: Path, definitions_cache: dict[str, dict]
+    ) -> list[tuple[str, str | None]]:
+        """Get names and comments of the functions defined in the source file.
+
+        The definitions are cached per file, so that the files that did not
+        change since the last run are not scanned again.
+        """
+        stat = path.stat()
+        signature = {
+            "function_regexp": self.config.function_regexp,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+
+        cached = definitions_cache.get(str(path), {}).copy()
+        definitions = cached.pop("definitions", None)
+        if cached == signature:
+            return [tuple(definition) for definition in definitions]
+
+        definitions = self._find_definitions(path)
+        definitions_cache[str(path)] = {**signature, "definitions": definitions}
+        return definitions
+
+    def _load_definitions_cache(self) -> dict[str, dict]:
+        """Load the function definitions found in the previous runs."""
+        if self.cache_dir is None:
+            return {}
+        try:
+            definitions_cache = _load_json(self.cache_dir / DEFINITIONS_CACHE_FILE)
+        except (OSError, ValueError):
+            return {}
+        # A corrupted or hand-edited file may hold any JSON value.
+        return definitions_cache if isinstance(definitions_cache, dict) else {}
+
+    def _save_definitions_cache(self, definitions_cache: dict[str, dict]):
+        if self.cache_dir is None:
+            return
+        with contextlib.suppress(OSError):
+            _write_atomically(
+                self.cache_dir / DEFINITIONS_CACHE_FILE, _dump_json(definitions_cache)
+            )
+
+    def _find_definitions(self, path: Path) -> list[tuple[str, str | None]]:
+        data = path.read_bytes()
+        # Every definition matched by the default regexp has an opening brace,
+        # so files without one can be skipped before decoding them.  Custom
+        # regexps may not need it, so they are always run.
+        if self.config.function_regexp == DEFAULT_FUNCTION_REGEXP and b"{" not in data:
+            return []
+
+        text = data.decode()
+        function_re = self._function_re
+        if self._function_re2 is not None and _matches_like_re(text):
+            function_re = self._function_re2
+
+        return [
+            (match.group("function_name"), match.group("comment"))
+            for match in function_re.finditer(text)
+        ]
+
+    def _get_directory_functions(self, path: Path) -> dict[str, ScriptFunctionRecord]:
+        functions = {}
+        with os.scandir(path) as entries:
+            for entry in entries:
+                # `DirEntry` caches the stat result, so the checks below
+                # cost at most one syscall per entry.
+                if entry.is_file() and entry.stat().st_mode & EXECUTABLE_MODE:
+                    functions.update(self._get_script_functions(path, entry.name))
+        return functions
+
+    def _get_script_functions(
+        self, directory: Path, name: str
+    ) -> dict[str, ScriptFunctionRecord]:
+        # Share the configured directory path between the records, rather than
+        # creating a new one for every script.
+        return ScriptFunctionRecord.build_all(name, directory, self.config)
 
     def get(self, name: str) -> AbstractFunctionRecord:
-        """Get a function record by name."""
-        for registry in (
-            self.special_functions,
-            self.source_functions,
-            self.script_functions,
-        ):
-            if name in registry:
-                return registry[name]
-        raise KeyError(name)
+        """Get a function record by name.
+
+        Special functions take precedence over source functions, and source
+        functions take precedence over scripts.
+        """
+        if name in SPECIAL_FUNCTIONS:
+            return self.special_functions[name]
+        if name in self.source_functions:
+            return self.source_functions[name]
+        return self.script_functions[name]
 
     def iter_user_functions(
         self,
@@ -342,9 +592,9 @@ class Registry:
         function_records = itertools.chain(
             self.source_functions.values(), self.script_functions.values()
         )
-        records = sorted(function_records, key=lambda r: (r.path, r.name))
-        for path, group in itertools.groupby(records, key=lambda r: r.path):
-            group_list = list(_generate_unique_records(group))
+        records = sorted(function_records, key=attrgetter("path", "name"))
+        for path, group in itertools.groupby(records, key=attrgetter("path")):
+            group_list = _get_unique_records(group)
             if group_list:
                 yield path, group_list
 
@@ -357,28 +607,66 @@ class Registry:
     def __contains__(self, name: str) -> bool:
         """Check if the function record is in the registry."""
         return (
-            name in self.source_functions
-            or name in self.special_functions
+            name in SPECIAL_FUNCTIONS
+            or name in self.source_functions
             or name in self.script_functions
         )
 
 
-def _generate_unique_records(
-    records: Iterable[AbstractFunctionRecord],
-) -> Iterator[AbstractFunctionRecord]:
-    """Get unique function records."""
-    seen = set()
+def _compile_re2(pattern: str) -> re.Pattern[str] | None:
+    """Compile the function regexp with RE2, if it's installed.
+
+    RE2 scans in linear time, but it lacks some features of the `re` module
+    (e.g. lookarounds and backreferences), so `re` is used for the patterns
+    it can't handle.
+    """
+    re2 = _import_re2()
+    if re2 is None:
+        return None
+    options = re2.Options()
+    options.log_errors = False
+    try:
+        return re2.compile("(?im)" + pattern, options)
+    except re2.error:
+        return None
+
+
+@functools.cache
+def _import_re2():
+    """Import RE2, if it's installed.
+
+    It's only needed to scan the source files, which most runs get from the
+    cache, so it's not imported at startup.
+    """
+    try:
+        import re2  # noqa: PLC0415 Imported lazily to speed up the startup
+    except ImportError:
+        return None
+    return re2
+
+
+def _matches_like_re(text: str) -> bool:
+    r"""Check if RE2 finds the same matches as `re` in the text.
+
+    RE2's `\w` and `\s` match only ASCII characters, and its `\s` also skips
+    some ASCII whitespace that `re` matches.
+    """
+    return text.isascii() and not any(char in text for char in RE2_MISSED_WHITESPACE)
+
+
+def _get_unique_records(records: Iterable[RecordT]) -> list[RecordT]:
+    """Get unique function records, keeping the first record for each function."""
+    unique_records: dict[str, RecordT] = {}
     for record in records:
-        if record.original_name not in seen:
-            yield record
-        seen.add(record.original_name)
+        unique_records.setdefault(record.original_name, record)
+    return list(unique_records.values())
 
 
 @click.group()
 @click.option(
     "-c",
     "--config",
-    default=f"{HOME_DIR}/.antialias.json",
+    default=_default_config_path,
     envvar="ANTIALIAS_CONFIG",
     type=click.Path(dir_okay=False, path_type=Path, resolve_path=True),
     help="Path to config file",
@@ -386,25 +674,143 @@ def _generate_unique_records(
 @click.option(
     "-r",
     "--files-root",
-    default=str(CWD),
+    # Click resolves the path, so the working directory is only looked up
+    # when the option is not given.
+    default=os.getcwd,
     envvar="ANTIALIAS_FILES_ROOT",
     type=click.Path(exists=True, resolve_path=True, path_type=Path),
     help="Root directory for source_files, if a relative paths are used.",
 )
+@click.option(
+    "--cache-dir",
+    default=_default_cache_dir,
+    envvar="ANTIALIAS_CACHE_DIR",
+    type=click.Path(file_okay=False, path_type=Path, resolve_path=True),
+    help="Directory to cache the discovered functions in.",
+)
 @click.pass_context
-def cli(ctx: click.Context, config: str, files_root: Path):
+def cli(ctx: click.Context, config: Path, files_root: Path, cache_dir: Path):
     """The main entrypoint for the command."""
     ctx.ensure_object(dict)
 
     if config.exists():
-        config_dict = json.loads(config.read_text())
+        config_dict = _load_json(config)
         config_obj = Config.from_dict(config_dict, files_root=files_root)
     else:
         config_obj = Config()
 
     ctx.obj["config_path"] = config
     ctx.obj["config"] = config_obj
-    ctx.obj["registry"] = Registry(config_obj)
+    ctx.obj["files_root"] = files_root
+    ctx.obj["cache_dir"] = cache_dir
+
+    # The command line up to the eval command, used to invoke the special functions.
+    argv = sys.argv
+    if EVAL_COMMAND in argv:
+        argv = argv[: argv.index(EVAL_COMMAND)]
+    ctx.obj["argv_prefix"] = tuple(argv)
+
+
+def _get_registry(ctx: click.Context) -> Registry:
+    """Get the registry, loading it on the first use.
+
+    Some commands don't need the functions at all, so they skip the discovery.
+    """
+    if "registry" not in ctx.obj:
+        config_path = ctx.obj["config_path"]
+        cache_dir = ctx.obj["cache_dir"]
+        ctx.obj["registry"] = Registry(
+            ctx.obj["config"],
+            cache_dir=cache_dir,
+            source_cache=cache_dir / f"sources-{_digest(str(config_path))}.bin",
+        )
+    return ctx.obj["registry"]
+
+
+def _read_cache(cache_path: Path, key: bytes):  # noqa: ANN202
+    """Read the cached object, or return None if it's missing or stale.
+
+    The key is stored in front of the object, so stale ones are never loaded.
+    """
+    try:
+        data = cache_path.read_bytes()
+    except OSError:
+        return None
+
+    header = key + CACHE_KEY_END
+    if not data.startswith(header):
+        return None
+
+    try:
+        return marshal.loads(memoryview(data)[len(header) :])  # noqa: S302 The cache is written by antialias itself
+    except (EOFError, TypeError, ValueError):
+        return None
+
+
+def _write_cache(cache_path: Path, key: bytes, obj: list):
+    """Cache the object, ignoring errors as the cache is only an optimization.
+
+    It's stored with `marshal`, which is built into the interpreter, so loading
+    it doesn't import anything.  The object must consist of built-in types.
+    """
+    with contextlib.suppress(OSError):
+        _write_atomically(cache_path, key + CACHE_KEY_END + marshal.dumps(obj))
+
+
+def _source_cache_key(config: Config) -> bytes:
+    """Describe everything that the source functions are found from.
+
+    The description is stored as is, since hashing it would cost more than
+    comparing it.
+    """
+    return b"".join(
+        (
+            # The `marshal` format may change between Python versions.
+            f"{sys.version}\n".encode(),
+            _stat_signature(Path(__file__)),
+            # The config contents rather than the file's stat, which may stay
+            # the same after an edit.  The paths in it are already resolved.
+            _dump_json(config.to_dict()),
+            # The records store the paths shortened relative to the home.
+            f"{_home_dir()}\n".encode(),
+            *map(_stat_signature, config.source_files),
+        )
+    )
+
+
+def _digest(text: str) -> str:
+    """Get a short digest of the text for a file name.
+
+    A collision only makes two configs share a cache file, since the full key
+    is stored in it.
+    """
+    return f"{zlib.crc32(text.encode()):08x}"
+
+
+def _stat_signature(path: Path) -> bytes:
+    """Describe the path's state in a way that changes when the file does."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return f"{path}:missing\n".encode()
+    return f"{path}:{stat.st_mode}:{stat.st_mtime_ns}:{stat.st_size}\n".encode()
+
+
+def _write_atomically(path: Path, data: bytes):
+    """Write the data so that readers never see a partially written file."""
+    import tempfile  # noqa: PLC0415 Only needed when the cache is updated
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file = tempfile.NamedTemporaryFile(dir=path.parent, delete=False)  # noqa: SIM115 Closed below, before the file is moved
+    temp_path = Path(file.name)
+    try:
+        with file:
+            file.write(data)
+        temp_path.replace(path)
+    except BaseException:
+        # Don't leave the partially written file in the cache directory.
+        temp_path.unlink(missing_ok=True)
+        raise
 
 
 @cli.command(name=EVAL_COMMAND)
@@ -414,19 +820,26 @@ def cli(ctx: click.Context, config: str, files_root: Path):
 def eval_(ctx: click.Context, function: str, args: tuple[str]):
     """Generate scripts for the shell to evaluate."""
     config = ctx.obj["config"]
-    registry = ctx.obj["registry"]
+    registry = _get_registry(ctx)
 
     if function not in registry:
         click.echo(f"Error: function {function} not found.", err=True)
         sys.exit(1)
 
-    prepared_files = [
-        shlex.quote(str(file)) for file in config.source_files if file.is_file()
-    ]
-    source_commands = "\n".join([f"source {file}" for file in prepared_files])
-
     record: AbstractFunctionRecord = registry.get(function)
-    command = record.format_command(args)
+
+    if isinstance(record, SpecialFunctionRecord):
+        # Special functions invoke antialias itself, which doesn't need the
+        # source files, so don't check and source them.
+        source_commands = ""
+    else:
+        source_commands = "\n".join(
+            f"source {shlex.quote(str(file))}"
+            for file in config.source_files
+            if file.is_file()
+        )
+
+    command = record.format_command(args, argv_prefix=ctx.obj["argv_prefix"])
 
     click.echo(f"""
     PID=$$
@@ -451,12 +864,12 @@ def eval_(ctx: click.Context, function: str, args: tuple[str]):
 def list_(ctx: click.Context):
     """Show available commands."""
     config: Config = ctx.obj["config"]
-    registry: Registry = ctx.obj["registry"]
-
-    for path, group in registry.iter_user_functions():
-        short_path = _shrink_path(path)
+    registry = _get_registry(ctx)
 
-        click.echo(f"Path: {short_path}\n")
+    # Collect the output and write it at once, rather than line by line.
+    lines: list[str] = []
+    for _, group in registry.iter_user_functions():
+        lines.extend((f"Path: {group[0].display_path}", ""))
 
         for record in group:
             help_string = f": {record.help}" if record.help else ""
@@ -466,7 +879,9 @@ def list_(ctx: click.Context):
                 extras.append(f"original: {record.original_name}")
 
             if len(record.aliases) > 1:
-                aliases_list_str = ", ".join(record.aliases - {record.name})
+                aliases_list_str = ", ".join(
+                    alias for alias in record.aliases if alias != record.name
+                )
                 prefix = "alias" if len(record.aliases) == 2 else "aliases"  # noqa: PLR2004 Magic value used
                 extras.append(f"{prefix}: {aliases_list_str}")
 
@@ -476,20 +891,15 @@ def list_(ctx: click.Context):
             else:
                 extras_str = ""
 
-            click.echo(f"  {record.name}{extras_str}{help_string}")
+            lines.append(f"  {record.name}{extras_str}{help_string}")
 
-        click.echo("")
+        lines.append("")
 
-    click.echo("Special functions:")
-    for special_name, record in registry.special_functions.items():
-        click.echo(f"  {special_name}: {record.help}")
+    lines.append("Special functions:")
+    for special_name, special_record in registry.special_functions.items():
+        lines.append(f"  {special_name}: {special_record.help}")
 
-
-def _shrink_path(path: Path) -> Path:
-    """Shrink the path to make it more readable."""
-    if path.is_relative_to(HOME_DIR):
-        return "~" / path.relative_to(HOME_DIR)
-    return path
+    click.echo("\n".join(lines))
 
 
 @cli.command
@@ -499,25 +909,52 @@ def dump_config(ctx: click.Context):
     config_path = ctx.obj["config_path"]
     config = ctx.obj["config"]
 
-    config_dict = asdict(config)
+    config_dict = config.to_dict()
 
     try:
-        original_config = json.loads(config_path.read_text())
+        original_config = _load_json(config_path)
     except FileNotFoundError:
         original_config = {}
 
     config_dict.update(original_config)
 
-    config_path.write_text(json.dumps(config_dict, indent=2, default=_path_to_json))
+    config_path.write_bytes(_dump_json(config_dict))
     click.echo(f"Config file updated: {config_path}")
 
 
-def _path_to_json(obj):
-    if isinstance(obj, Path):
-        return str(obj)
-    obj_type = type(obj).__name__
-    message = f"Object of type {obj_type} is not JSON serializable."
-    raise TypeError(message)
+def _load_json(path: Path):  # noqa: ANN202
+    """Load a JSON file, using orjson when it is installed."""
+    orjson = _import_orjson()
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+
+    import json  # noqa: PLC0415 Only needed without orjson
+
+    return json.loads(path.read_text())
+
+
+def _dump_json(data) -> bytes:  # noqa: ANN001
+    """Serialize the data to an indented JSON, using orjson when it is installed."""
+    orjson = _import_orjson()
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+    import json  # noqa: PLC0415 Only needed without orjson
+
+    return json.dumps(data, indent=2).encode()
+
+
+@functools.cache
+def _import_orjson():
+    """Import orjson, if it's installed.
+
+    It's imported on the first use, like the stdlib `json` it replaces.
+    """
+    try:
+        import orjson  # noqa: PLC0415 Imported lazily to speed up the startup
+    except ImportError:
+        return None
+    return orjson
 
 
 @cli.command
@@ -532,21 +969,27 @@ def completion(ctx: click.Context, shell: str | None, name: str):
     if not shell:
         shell = Path(os.getenv("SHELL", "")).name
 
-    registry = ctx.obj["registry"]
+    registry = _get_registry(ctx)
 
     if shell == "bash":
-        names = [record.name for record in registry.iter_all()]
+        # `compgen -W` splits the word list and removes the quotes in it, so
+        # the names are quoted with `shlex`.  The list itself is put in a
+        # double-quoted string, so what it doesn't protect is escaped too.
+        names = shlex.join(record.name for record in registry.iter_all())
         click.echo(
-            BASH_COMPLETION_TEMPLATE.format(names=shlex.join(names), wrapper_name=name)
+            BASH_COMPLETION_TEMPLATE.format(
+                names=names.translate(DOUBLE_QUOTE_ESCAPES), wrapper_name=name
+            )
         )
     elif shell == "zsh":
-        subcommands = [
-            f"{r.name}: {r.help or r.original_name}" for r in registry.iter_all()
-        ]
+        # List one subcommand per line of the array.  `shlex.quote` leaves
+        # shell-safe words as they are, so only the help texts get quoted.
+        subcommands = ZSH_SUBCOMMANDS_SEPARATOR.join(
+            shlex.quote(f"{r.name}: {r.help or r.original_name}")
+            for r in registry.iter_all()
+        )
         click.echo(
-            ZSH_COMPLETION_TEMPLATE.format(
-                subcommands=shlex.join(subcommands), wrapper_name=name
-            )
+            ZSH_COMPLETION_TEMPLATE.format(subcommands=subcommands, wrapper_name=name)
         )
     else:
         cmd = shlex.join(sys.argv)
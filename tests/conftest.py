@@ -1,7 +1,7 @@
 """Pytest configuration for the antialias package."""
 
 import json
-from dataclasses import asdict
+from pathlib import Path
 from textwrap import dedent
 
 import pytest
@@ -16,24 +16,26 @@ def config_overrides():
 
 
 @pytest.fixture
-def config(config_overrides):
-    return Config.from_dict(config_overrides)
+def config(config_overrides, tmpdir):
+    return Config.from_dict(config_overrides, files_root=Path(tmpdir))
 
 
 @pytest.fixture
 def config_path(config, tmpdir):
     path = tmpdir / "config.json"
-    config_dict = asdict(config)
-    path.write_text(json.dumps(config_dict, indent=4), "utf-8")
+    path.write_text(json.dumps(config.to_dict(), indent=4), "utf-8")
     return path
 
 
 @pytest.fixture
-def run_cli(config_path):
+def run_cli(config_path, tmpdir):
     runner = CliRunner()
+    cache_dir = tmpdir / "cache"
 
     def run(*args: tuple, **kwargs: dict) -> Result:
-        return runner.invoke(cli, ["--config", config_path, *args], **kwargs)
+        return runner.invoke(
+            cli, ["--config", config_path, "--cache-dir", cache_dir, *args], **kwargs
+        )
 
     return run
 
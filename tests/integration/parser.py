@@ -1,5 +1,6 @@
 """Parsing the README.md file to get the test cases."""
 
+import re
 from dataclasses import dataclass, field
 from pprint import pprint
 
@@ -12,6 +13,21 @@ CODEBLOCK_FENCE = "```"
 SHELL_PROMPT = "$ "
 COMMENTED_SHELL_PROMPT = "# "
 
+_TESTCASE_RE = re.compile(
+    rf"^{re.escape(TESTCASE_COMMENT)}\n(?P<text>.*?)^{re.escape(TESTCASE_END_COMMENT)}$",
+    flags=re.MULTILINE | re.DOTALL,
+)
+_COMMENT_RE = re.compile(
+    rf"^{re.escape(COMMENTED_SHELL_PROMPT)}.*\n?",
+    flags=re.MULTILINE,
+)
+# A command and the lines up to the next command or the end of the code block.
+_OUTPUT_END = f"{re.escape(SHELL_PROMPT)}|{re.escape(CODEBLOCK_FENCE)}"
+_COMMAND_RE = re.compile(
+    rf"^{re.escape(SHELL_PROMPT)}(?P<input>.*)\n?(?P<output>(?:(?!{_OUTPUT_END}).*\n?)*)",
+    flags=re.MULTILINE,
+)
+
 
 @dataclass
 class DocTestCase:
@@ -24,38 +40,17 @@ class DocTestCase:
 def get_testcases():
     """Get the test cases from the README.md file."""
     testcases = []
-    collect = False
-    cur_testcase = None
-
-    for line in README.read_text().splitlines():
-        if line == TESTCASE_COMMENT:
-            collect = True
-            continue
-        if line == TESTCASE_END_COMMENT:
-            collect = False
-            continue
-
-        if not collect or line.startswith(COMMENTED_SHELL_PROMPT):
-            continue
-
-        if line.startswith(CODEBLOCK_FENCE):
-            if cur_testcase is not None:
-                testcases.append(cur_testcase)
-                cur_testcase = None
-            continue
-
-        if line.startswith(SHELL_PROMPT):
-            if cur_testcase is not None:
-                testcases.append(cur_testcase)
-            test_input = line.removeprefix(SHELL_PROMPT)
-            cur_testcase = DocTestCase(input=test_input)
-            continue
-
-        assert cur_testcase is not None
-        cur_testcase.output.append(line)
-
-    if cur_testcase is not None:
-        testcases.append(cur_testcase)
+
+    for testcase_match in _TESTCASE_RE.finditer(README.read_text()):
+        text = _COMMENT_RE.sub("", testcase_match.group("text"))
+        testcases.extend(
+            DocTestCase(
+                input=command_match.group("input"),
+                output=command_match.group("output").splitlines(),
+            )
+            for command_match in _COMMAND_RE.finditer(text)
+        )
+
     return testcases
 
 
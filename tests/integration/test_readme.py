@@ -1,14 +1,16 @@
 """Integration tests for the README.md file."""
 
+import os
 import re
+from pathlib import Path
 from subprocess import STDOUT, CalledProcessError, check_output
 
 from tests.integration.fixtures import BASHRC_PATH, DATA_DIR, INTEGRATION_TESTS_DIR
 from tests.integration.parser import get_testcases
 
 REPLACEMENTS = (
-    (r"^/.*/\bbash\b", "bash"),
-    (re.escape(f"{DATA_DIR}/"), ""),
+    (re.compile(r"^/.*/\bbash\b"), "bash"),
+    (re.compile(re.escape(f"{DATA_DIR}/")), ""),
 )
 
 
@@ -17,14 +19,14 @@ def pytest_generate_tests(metafunc):
         metafunc.parametrize("doc_testcase", get_testcases(), ids=lambda x: x.input)
 
 
-def test_readme(doc_testcase):
+def test_readme(doc_testcase, tmp_path):
     """Test the README.md file."""
-    output = _run(doc_testcase.input)
+    output = _run(doc_testcase.input, cache_dir=tmp_path)
     expected_output = _normalize_output("\n".join(doc_testcase.output))
     assert _normalize_output(output) == expected_output
 
 
-def _run(cmd: str) -> str:
+def _run(cmd: str, *, cache_dir: Path) -> str:
     """Run the input and return the output."""
     script = f"bash -c 'source {BASHRC_PATH}; {cmd}'"
     try:
@@ -34,6 +36,7 @@ def _run(cmd: str) -> str:
             text=True,
             stderr=STDOUT,
             cwd=INTEGRATION_TESTS_DIR,
+            env={**os.environ, "ANTIALIAS_CACHE_DIR": str(cache_dir)},
         )
     except CalledProcessError as e:
         return e.output
@@ -42,6 +45,6 @@ def _run(cmd: str) -> str:
 def _normalize_output(output: str) -> str:
     """Normalize the output."""
     for pattern, replacement in REPLACEMENTS:
-        output = re.sub(pattern, replacement, output)
+        output = pattern.sub(replacement, output)
 
     return output.strip()
@@ -1,7 +1,25 @@
 """Tests for the main functionality."""
 
+import copy
+import json
+import os
+import shutil
+from pathlib import Path
+from subprocess import check_output
+
+import pytest
+
+from antialias.__main__ import (
+    DEFAULT_FUNCTION_REGEXP,
+    Config,
+    Registry,
+)
 from tests.conftest import assert_result
 
+BASH = shutil.which("bash")
+# Names that need quoting in the completion script.
+BASH_ALIASES = ["it's", "a b", '"$HOME"']
+
 
 def test_smoke(run_cli):
     result = run_cli("list")
@@ -13,3 +31,207 @@ def test_smoke(run_cli):
           --list: List all available functions.
         """,
     )
+
+
+@pytest.mark.parametrize(
+    "function_regexp",
+    [
+        pytest.param(DEFAULT_FUNCTION_REGEXP, id="default"),
+        # Lookarounds are not supported by RE2, so `re` should be used instead.
+        pytest.param(r"^(?P<function_name>\w+)(?=\(\))\(\) \{(?P<comment>)", id="re"),
+    ],
+)
+def test_function_regexp(tmp_path, function_regexp):
+    source = tmp_path / "source.sh"
+    source.write_text("f_1() {\n  echo 1\n}\nF_2() {\n  echo 2\n}\n")
+    empty_source = tmp_path / "empty.sh"
+    empty_source.touch()
+    no_functions_source = tmp_path / "env.sh"
+    no_functions_source.write_text("export F_3=3\n")
+    config = Config(
+        source_files=[source, empty_source, no_functions_source],
+        function_regexp=function_regexp,
+    )
+
+    registry = Registry(config)
+
+    assert set(registry.source_functions) == {"f_1", "F_2"}
+
+
+@pytest.mark.parametrize(
+    "use_re2",
+    [
+        pytest.param(True, id="re2"),
+        pytest.param(False, id="re"),
+    ],
+)
+def test_non_ascii_function_names(tmp_path, monkeypatch, use_re2):
+    if not use_re2:
+        monkeypatch.setattr("antialias.__main__._import_re2", lambda: None)
+    source = tmp_path / "source.sh"
+    source.write_text("café() {  # crème\n}\nnaïve_fn() {\n}\n")
+    config = Config(source_files=[source])
+
+    registry = Registry(config)
+
+    assert set(registry.source_functions) == {"café", "naïve_fn"}
+    assert registry.get("café").help == "crème"
+
+
+def test_source_cache(tmp_path):
+    source = tmp_path / "source.sh"
+    source.write_text("f_1() {\n}\n")
+    config = Config(source_files=[source])
+    cache_dir = tmp_path / "cache"
+    source_cache = cache_dir / "sources.bin"
+
+    def load_registry():
+        return Registry(config, cache_dir=cache_dir, source_cache=source_cache)
+
+    registry = load_registry()
+    assert set(registry.source_functions) == {"f_1"}
+    assert source_cache.exists()
+
+    cached_registry = load_registry()
+    assert cached_registry.source_functions == registry.source_functions
+
+    source.write_text("f_1() {\n}\nf_2() {\n}\n")
+    updated_registry = load_registry()
+    assert set(updated_registry.source_functions) == {"f_1", "f_2"}
+
+    # The config is part of the key, even if its file looks the same.
+    config.underscore_to_dash = True
+    updated_registry = load_registry()
+    assert set(updated_registry.source_functions) == {"f-1", "f-2"}
+
+
+def test_failed_cache_write(tmp_path, monkeypatch):
+    source = tmp_path / "source.sh"
+    source.write_text("f_1() {\n}\n")
+    cache_dir = tmp_path / "cache"
+
+    def replace(*_):
+        raise OSError
+
+    monkeypatch.setattr(Path, "replace", replace)
+    registry = Registry(
+        Config(source_files=[source]),
+        cache_dir=cache_dir,
+        source_cache=cache_dir / "sources.bin",
+    )
+    assert set(registry.source_functions) == {"f_1"}
+    # The temporary files are removed.
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_config_to_dict(tmp_path):
+    data = {
+        "source_files": [str(tmp_path / "a.sh")],
+        "script_directories": [str(tmp_path / "bin")],
+        "underscore_to_dash": True,
+        "keep_original_name": False,
+        "function_regexp": DEFAULT_FUNCTION_REGEXP,
+        "overrides": {
+            "*": {"functions": {"f": {"name": "g", "help": None, "aliases": ["g"]}}},
+            str(tmp_path / "a.sh"): {"functions": {}},
+        },
+    }
+    # `from_dict` consumes the nested override dictionaries.
+    config = Config.from_dict(copy.deepcopy(data), files_root=tmp_path)
+    assert config.to_dict() == data
+    assert Config.from_dict(config.to_dict(), files_root=tmp_path) == config
+
+
+def test_source_file_cache(tmp_path):
+    source = tmp_path / "source.sh"
+    source.write_text("f_1() {\n}\n")
+    config = Config(source_files=[source])
+    cache_dir = tmp_path / "cache"
+
+    registry = Registry(config, cache_dir=cache_dir)
+    assert set(registry.source_functions) == {"f_1"}
+
+    # Same size and modification time, so the file is not scanned again.
+    stat = source.stat()
+    source.write_text("f_2() {\n}\n")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    registry = Registry(config, cache_dir=cache_dir)
+    assert set(registry.source_functions) == {"f_1"}
+
+    source.write_text("f_3() {\n}\n")
+    registry = Registry(config, cache_dir=cache_dir)
+    assert set(registry.source_functions) == {"f_3"}
+
+
+def test_source_file_cache_pruning(tmp_path):
+    sources = [tmp_path / "a.sh", tmp_path / "b.sh"]
+    for source in sources:
+        source.write_text(f"{source.stem}() {{\n}}\n")
+    cache_dir = tmp_path / "cache"
+
+    def cached_paths():
+        return set(json.loads((cache_dir / "definitions.json").read_text()))
+
+    for config_sources in (sources[:1], sources[1:]):
+        registry = Registry(Config(source_files=config_sources), cache_dir=cache_dir)
+        assert len(registry.source_functions) == 1
+    # The entries of the other config's files are kept.
+    assert cached_paths() == {str(source) for source in sources}
+
+    sources[1].unlink()
+    sources[0].write_text("c() {\n}\n")
+    registry = Registry(Config(source_files=sources[:1]), cache_dir=cache_dir)
+    assert set(registry.source_functions) == {"c"}
+    assert cached_paths() == {str(sources[0])}
+
+
+@pytest.mark.parametrize("contents", ["[]", "{", "null"])
+def test_invalid_source_file_cache(tmp_path, contents):
+    source = tmp_path / "source.sh"
+    source.write_text("f_1() {\n}\n")
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / "definitions.json").write_text(contents)
+
+    registry = Registry(Config(source_files=[source]), cache_dir=cache_dir)
+    assert set(registry.source_functions) == {"f_1"}
+
+
+def test_lazy_discovery(tmp_path):
+    source = tmp_path / "source.sh"
+    source.write_text("f_1() {\n}\n")
+    config = Config(source_files=[source], script_directories=[tmp_path / "missing"])
+
+    registry = Registry(config)
+
+    # The missing script directory is not scanned, since the source function
+    # is found first.
+    assert registry.get("f_1").original_name == "f_1"
+    assert "--list" in registry
+
+
+@pytest.mark.skipif(BASH is None, reason="bash is not installed")
+@pytest.mark.parametrize(
+    "config_overrides",
+    [
+        {
+            "source_files": ["source.sh"],
+            "overrides": {"*": {"functions": {"f": {"aliases": BASH_ALIASES}}}},
+        }
+    ],
+)
+def test_bash_completion(run_cli, tmp_path):
+    (tmp_path / "source.sh").write_text("f() {\n}\n")
+
+    result = run_cli("completion", "--bash")
+    assert_result(result)
+
+    script = f"""{result.output}
+COMP_WORDS=(als ""); COMP_CWORD=1
+_als_completion
+printf '%s\\n' "${{COMPREPLY[@]}}"
+"""
+    output = check_output([BASH], input=script, text=True)  # noqa: S603 The script is generated by the test
+    completions = output.splitlines()
+    assert set(BASH_ALIASES) <= set(completions)
+    assert "a" not in completions